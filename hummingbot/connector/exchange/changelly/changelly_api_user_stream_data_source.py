@@ -0,0 +1,336 @@
+import asyncio
+import logging
+from operator import itemgetter
+from typing import Any, Dict, List, NamedTuple, Optional
+
+import hummingbot.connector.exchange.changelly.changelly_constants as CONSTANTS
+from hummingbot.connector.exchange.changelly.changelly_auth import ChangellyAuth
+from hummingbot.core.data_type.user_stream_tracker_data_source import UserStreamTrackerDataSource
+from hummingbot.core.utils.async_utils import safe_ensure_future
+from hummingbot.core.web_assistant.connections.data_types import WSJSONRequest
+from hummingbot.core.web_assistant.web_assistants_factory import WebAssistantsFactory
+from hummingbot.core.web_assistant.ws_assistant import WSAssistant
+from hummingbot.logger import HummingbotLogger
+
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    from ujson import loads as _json_loads
+
+
+class ChangellyOrderUpdate(NamedTuple):
+    id: int
+    client_order_id: str
+    status: str
+    price: str
+    quantity: str
+    quantity_cumulative: str
+    updated_at: str
+
+
+class ChangellyBalanceUpdate(NamedTuple):
+    currency: str
+    available: str
+    reserved: str
+
+
+# Bound once at import time; a single itemgetter call extracts all the fields of a report in one
+# C-level pass instead of one dict lookup per field.
+_ORDER_FIELDS = itemgetter("id", "client_order_id", "status", "price", "quantity", "quantity_cumulative",
+                           "updated_at")
+_BALANCE_FIELDS = itemgetter("currency", "available", "reserved")
+
+
+class _RingBuffer:
+    """
+    A bounded ring buffer exposing the consumer side of ``asyncio.Queue``.
+
+    Like the deque-backed queue it replaces, ``put_batch`` delivers a whole batch of updates with
+    a single consumer wakeup per websocket frame. The backing store is a fixed-capacity list with
+    head/tail pointer arithmetic, so a slow consumer cannot grow memory without bound during frame
+    bursts: once the buffer is full the oldest updates are dropped and a warning is logged.
+    One slot is kept empty to distinguish a full buffer from an empty one.
+    """
+
+    DEFAULT_CAPACITY = 4096
+
+    __slots__ = ("_buf", "_head", "_tail", "_cap", "_waiter")
+
+    _logger: Optional[HummingbotLogger] = None
+
+    @classmethod
+    def logger(cls) -> HummingbotLogger:
+        if cls._logger is None:
+            cls._logger = logging.getLogger(HummingbotLogger.logger_name_for_class(cls))
+        return cls._logger
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        self._buf: List[Any] = [None] * capacity
+        self._head = 0
+        self._tail = 0
+        self._cap = capacity
+        self._waiter: Optional[asyncio.Future] = None
+
+    def put_batch(self, items: List[Any]):
+        buf = self._buf
+        cap = self._cap
+        head = self._head
+        tail = self._tail
+        dropped = 0
+        for item in items:
+            buf[tail] = item
+            tail = (tail + 1) % cap
+            if tail == head:
+                buf[head] = None
+                head = (head + 1) % cap
+                dropped += 1
+        self._head = head
+        self._tail = tail
+        if dropped:
+            self.logger().warning(f"User stream buffer is full: dropped the {dropped} oldest update(s).")
+        waiter = self._waiter
+        if waiter is not None and not waiter.done():
+            waiter.set_result(None)
+
+    def put_nowait(self, item: Any):
+        self.put_batch((item,))
+
+    async def get(self) -> Any:
+        while self._head == self._tail:
+            await self._wait_for_data()
+        head = self._head
+        item = self._buf[head]
+        self._buf[head] = None
+        self._head = (head + 1) % self._cap
+        return item
+
+    async def get_batch(self) -> List[Any]:
+        while self._head == self._tail:
+            await self._wait_for_data()
+        head = self._head
+        tail = self._tail
+        buf = self._buf
+        if head < tail:
+            items = buf[head:tail]
+            buf[head:tail] = [None] * (tail - head)
+        else:
+            items = buf[head:] + buf[:tail]
+            buf[head:] = [None] * (self._cap - head)
+            buf[:tail] = [None] * tail
+        self._head = tail
+        return items
+
+    async def _wait_for_data(self):
+        self._waiter = asyncio.get_running_loop().create_future()
+        try:
+            await self._waiter
+        finally:
+            self._waiter = None
+
+    @property
+    def capacity(self) -> int:
+        return self._cap
+
+    def empty(self) -> bool:
+        return self._head == self._tail
+
+    def qsize(self) -> int:
+        return (self._tail - self._head) % self._cap
+
+
+class ChangellyAPIUserStreamDataSource(UserStreamTrackerDataSource):
+
+    SPOT_STREAM_ID = 1
+
+    _logger: Optional[HummingbotLogger] = None
+
+    def __init__(self,
+                 auth: ChangellyAuth,
+                 trading_pairs: List[str],
+                 api_factory: WebAssistantsFactory,
+                 domain: str = CONSTANTS.DEFAULT_DOMAIN):
+        super().__init__()
+        self._auth: ChangellyAuth = auth
+        self._trading_pairs = trading_pairs
+        self._api_factory = api_factory
+        self._domain = domain
+        self._last_ws_message_sent_timestamp = 0
+        self._ping_handle: Optional[asyncio.TimerHandle] = None
+        # Per-frame dispatch goes through a dict lookup instead of a chain of string comparisons.
+        self._handlers = {
+            CONSTANTS.SPOT_ORDER_NOTIFICATION: self._handle_spot_order,
+            CONSTANTS.SPOT_ORDERS_NOTIFICATION: self._handle_spot_order,
+            CONSTANTS.SPOT_BALANCE_NOTIFICATION: self._handle_spot_balance,
+        }
+
+    async def _connected_websocket_assistant(self) -> WSAssistant:
+        ws: WSAssistant = await self._get_ws_assistant()
+        await ws.connect(ws_url=CONSTANTS.WSS_TRADING_URL, ping_timeout=CONSTANTS.WS_HEARTBEAT_TIME_INTERVAL)
+        await self._authenticate_connection(ws)
+        return ws
+
+    async def _authenticate_connection(self, ws: WSAssistant):
+        """
+        Sends the authentication message.
+
+        :param ws: the websocket assistant used to connect to the exchange
+        """
+        login_request: WSJSONRequest = WSJSONRequest(payload=await self._auth.ws_authenticate())
+        await ws.send(login_request)
+
+    async def _subscribe_channels(self, ws: WSAssistant):
+        """
+        Subscribes to the spot order and balance events through the provided websocket connection.
+
+        :param ws: the websocket assistant used to connect to the exchange
+        """
+        try:
+            # One spot_subscribe with empty params covers every symbol, so a single frame is all
+            # the coalescing this subscription needs.
+            payload = {
+                "method": CONSTANTS.SPOT_SUBSCRIBE,
+                "params": {},
+                "id": self.SPOT_STREAM_ID,
+            }
+            subscribe_request: WSJSONRequest = WSJSONRequest(payload=payload)
+            await ws.send(subscribe_request)
+            self.logger().info("Subscribed to private order and balance channels...")
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            self.logger().error("Unexpected error occurred subscribing to private channels...", exc_info=True)
+            raise
+
+    async def listen_for_user_stream(self, output: asyncio.Queue):
+        """
+        Connects to the user private channel in the exchange using a websocket connection. With the established
+        connection listens to all order and balance events provided by the exchange, and stores them in the
+        output queue
+
+        :param output: the queue to use to store the received messages
+        """
+        # The handlers batch their updates into the bounded ring buffer and a relay forwards the
+        # drained batches into the tracker's queue. The relay stops draining while the tracker
+        # queue backlog exceeds the ring capacity, so a slow consumer backs pressure up into the
+        # ring and its drop-oldest policy engages instead of growing the tracker queue without
+        # bound.
+        buffer = _RingBuffer()
+        relay_task = safe_ensure_future(self._relay_buffered_updates(buffer, output))
+        ws = None
+        try:
+            while True:
+                try:
+                    ws = await self._connected_websocket_assistant()
+                    await self._subscribe_channels(ws)
+                    # Heartbeat bookkeeping runs on the loop's monotonic clock: it is immune to NTP
+                    # adjustments and avoids the Python-level indirection of self._time() per update.
+                    self._last_ws_message_sent_timestamp = asyncio.get_running_loop().time()
+                    # The heartbeat runs on a loop timer instead of wrapping every read in
+                    # asyncio.wait_for, which allocates a wrapping task and a cancel handler per call
+                    # and tears down the message iterator whenever the timeout fires.
+                    self._schedule_ping(ws)
+                    await self._process_ws_messages(ws=ws, output=buffer)
+                except asyncio.CancelledError:
+                    raise
+                except Exception:
+                    self.logger().exception(
+                        "Unexpected error while listening to user stream. Retrying after 5 seconds...")
+                finally:
+                    self._cancel_ping()
+                    ws and await ws.disconnect()
+                    await self._sleep(5)
+        finally:
+            relay_task.cancel()
+
+    async def _relay_buffered_updates(self, buffer: _RingBuffer, output: asyncio.Queue):
+        while True:
+            while output.qsize() >= buffer.capacity:
+                # The consumer is not keeping up; hold the backlog in the ring (dropping the
+                # oldest updates once it fills) instead of moving it into the unbounded queue.
+                await self._sleep(1.0)
+            for update in await buffer.get_batch():
+                output.put_nowait(update)
+
+    def _schedule_ping(self, ws: WSAssistant):
+        loop = asyncio.get_running_loop()
+        self._ping_handle = loop.call_later(CONSTANTS.WS_HEARTBEAT_TIME_INTERVAL, self._send_ping_cb, ws)
+
+    def _send_ping_cb(self, ws: WSAssistant):
+        loop = asyncio.get_running_loop()
+        heartbeat = CONSTANTS.WS_HEARTBEAT_TIME_INTERVAL
+        idle_time = loop.time() - self._last_ws_message_sent_timestamp
+        if idle_time < heartbeat:
+            # A message went out within the heartbeat interval; check again when the remainder of
+            # the interval has passed instead of pinging an active connection.
+            self._ping_handle = loop.call_later(heartbeat - idle_time, self._send_ping_cb, ws)
+            return
+        safe_ensure_future(self._send_ping(ws))
+        self._ping_handle = loop.call_later(heartbeat, self._send_ping_cb, ws)
+
+    def _cancel_ping(self):
+        if self._ping_handle is not None:
+            self._ping_handle.cancel()
+            self._ping_handle = None
+
+    async def _send_ping(self, ws: WSAssistant):
+        try:
+            ping_request = WSJSONRequest(payload={"method": "ping"})
+            await ws.send(ping_request)
+            self._last_ws_message_sent_timestamp = asyncio.get_running_loop().time()
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            self.logger().warning("Failed to send heartbeat ping over the user stream connection.")
+
+    async def _process_ws_messages(self, ws: WSAssistant, output: asyncio.Queue):
+        handlers = self._handlers
+        async for ws_response in ws.iter_messages():
+            data = ws_response.data
+            if isinstance(data, (str, bytes)):
+                # Binary frames (and frames the assistant could not parse) arrive raw; decode them
+                # with orjson when available, which is several times faster than stdlib json on the
+                # small per-order/per-balance payloads this stream carries.
+                data = _json_loads(data)
+            method = data.get("method")
+            if method is None:
+                continue
+            handler = handlers.get(method)
+            if handler is not None:
+                handler(data["params"], output)
+
+    def _handle_spot_order(self, data: Any, output_queue: asyncio.Queue):
+        if not data:
+            # Subscription acks commonly carry an empty snapshot; skip the conversion pass.
+            return
+        if isinstance(data, dict):
+            # The spot_orders snapshot carries a list of reports, but the singular spot_order
+            # notification carries one report dict.
+            data = (data,)
+        self._put_batch(output_queue, [self._convert_to_internal_order_format(order) for order in data])
+
+    def _handle_spot_balance(self, data: List[Dict[str, Any]], output_queue: asyncio.Queue):
+        if not data:
+            return
+        self._put_batch(output_queue, [self._convert_to_internal_balance_format(balance) for balance in data])
+
+    @staticmethod
+    def _put_batch(output_queue: asyncio.Queue, updates: List[Any]):
+        # Deliver the whole batch with a single consumer wakeup when the queue supports it, and
+        # fall back to per-item puts for a plain asyncio.Queue provided by the user stream tracker.
+        put_batch = getattr(output_queue, "put_batch", None)
+        if put_batch is not None:
+            put_batch(updates)
+        else:
+            for update in updates:
+                output_queue.put_nowait(update)
+
+    def _convert_to_internal_order_format(self, order: Dict[str, Any]) -> ChangellyOrderUpdate:
+        return ChangellyOrderUpdate._make(_ORDER_FIELDS(order))
+
+    def _convert_to_internal_balance_format(self, balance: Dict[str, Any]) -> ChangellyBalanceUpdate:
+        return ChangellyBalanceUpdate._make(_BALANCE_FIELDS(balance))
+
+    async def _get_ws_assistant(self) -> WSAssistant:
+        if self._ws_assistant is None:
+            self._ws_assistant = await self._api_factory.get_ws_assistant()
+        return self._ws_assistant
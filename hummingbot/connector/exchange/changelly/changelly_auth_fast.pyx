@@ -0,0 +1,31 @@
+# distutils: language=c++
+from binascii import b2a_base64, hexlify
+
+
+def sign_message(object hmac_template, list message):
+    """
+    Signs the message fragments with a copy of the prepared HMAC state.
+
+    :param hmac_template: an HMAC object with the key schedule already applied
+    :param message: the bytes fragments to sign
+
+    :return: the hex encoded signature as bytes
+    """
+    mac = hmac_template.copy()
+    for part in message:
+        mac.update(part)
+    return hexlify(mac.digest())
+
+
+def auth_token(bytes api_key, bytes signature, bytes timestamp):
+    """
+    Builds the base64 token carried in the HS256 Authorization header.
+
+    :param api_key: the api key as bytes
+    :param signature: the hex encoded request signature as bytes
+    :param timestamp: the millisecond timestamp as bytes
+
+    :return: the base64 encoded token as str
+    """
+    cdef bytes joined = api_key + b":" + signature + b":" + timestamp
+    return b2a_base64(joined, newline=False).decode("ascii")
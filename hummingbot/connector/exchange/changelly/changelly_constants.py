@@ -0,0 +1,21 @@
+EXCHANGE_NAME = "changelly"
+DEFAULT_DOMAIN = "changelly_main"
+
+HBOT_ORDER_ID_PREFIX = "CHANGELLY-"
+MAX_ORDER_ID_LEN = 32
+
+# Base URLs
+REST_URL = "https://api.pro.changelly.com/api/3"
+WSS_TRADING_URL = "wss://api.pro.changelly.com/api/3/ws/trading"
+
+WS_HEARTBEAT_TIME_INTERVAL = 30.0
+
+# Websocket methods
+WS_LOGIN_METHOD = "login"
+SPOT_SUBSCRIBE = "spot_subscribe"
+SPOT_UNSUBSCRIBE = "spot_unsubscribe"
+
+# Websocket notifications
+SPOT_ORDER_NOTIFICATION = "spot_order"
+SPOT_ORDERS_NOTIFICATION = "spot_orders"
+SPOT_BALANCE_NOTIFICATION = "spot_balance"
@@ -0,0 +1,405 @@
+import asyncio
+import json
+from typing import Awaitable, Optional
+from unittest import TestCase
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from hummingbot.connector.exchange.changelly import changelly_constants as CONSTANTS
+from hummingbot.connector.exchange.changelly.changelly_api_user_stream_data_source import (
+    ChangellyAPIUserStreamDataSource,
+    ChangellyBalanceUpdate,
+    ChangellyOrderUpdate,
+    _RingBuffer,
+)
+from hummingbot.connector.exchange.changelly.changelly_auth import ChangellyAuth
+from hummingbot.connector.test_support.network_mocking_assistant import NetworkMockingAssistant
+from hummingbot.core.api_throttler.async_throttler import AsyncThrottler
+from hummingbot.core.web_assistant.connections.data_types import WSResponse
+from hummingbot.core.web_assistant.web_assistants_factory import WebAssistantsFactory
+
+
+class ChangellyAPIUserStreamDataSourceTests(TestCase):
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.ev_loop = asyncio.get_event_loop()
+        self.trading_pair = "COINALPHA-HBOT"
+        self.data_source = ChangellyAPIUserStreamDataSource(
+            auth=MagicMock(),
+            trading_pairs=[self.trading_pair],
+            api_factory=MagicMock(),
+        )
+
+    def async_run_with_timeout(self, coroutine: Awaitable, timeout: int = 1):
+        ret = self.ev_loop.run_until_complete(asyncio.wait_for(coroutine, timeout))
+        return ret
+
+    def test_ring_buffer_delivers_batches_in_order(self):
+        queue = _RingBuffer()
+
+        queue.put_batch([1, 2])
+        queue.put_batch([3])
+
+        self.assertEqual(3, queue.qsize())
+        self.assertEqual(1, self.async_run_with_timeout(queue.get()))
+        self.assertEqual(2, self.async_run_with_timeout(queue.get()))
+        self.assertEqual(3, self.async_run_with_timeout(queue.get()))
+        self.assertTrue(queue.empty())
+
+    def test_ring_buffer_drops_oldest_updates_when_full(self):
+        queue = _RingBuffer(capacity=4)
+
+        queue.put_batch([1, 2, 3, 4, 5])
+
+        # One slot is kept empty, so capacity=4 retains the three most recent updates
+        self.assertEqual(3, queue.qsize())
+        self.assertEqual([3, 4, 5], self.async_run_with_timeout(queue.get_batch()))
+        self.assertTrue(queue.empty())
+
+    def test_ring_buffer_get_batch_drains_wrapped_buffer(self):
+        queue = _RingBuffer(capacity=4)
+
+        queue.put_batch([1, 2])
+        self.assertEqual(1, self.async_run_with_timeout(queue.get()))
+        self.assertEqual(2, self.async_run_with_timeout(queue.get()))
+        queue.put_batch([3, 4, 5])
+
+        self.assertEqual([3, 4, 5], self.async_run_with_timeout(queue.get_batch()))
+        self.assertTrue(queue.empty())
+
+    def test_ring_buffer_get_waits_for_next_batch(self):
+        queue = _RingBuffer()
+
+        async def get_after_put():
+            getter = asyncio.get_event_loop().create_task(queue.get())
+            await asyncio.sleep(0)
+            queue.put_batch(["update"])
+            return await getter
+
+        self.assertEqual("update", self.async_run_with_timeout(get_after_put()))
+
+    def test_relay_forwards_drained_batches_to_output_queue(self):
+        async def run():
+            buffer = _RingBuffer()
+            output = asyncio.Queue()
+            relay = asyncio.get_event_loop().create_task(
+                self.data_source._relay_buffered_updates(buffer, output))
+            buffer.put_batch(["first", "second"])
+            updates = [await asyncio.wait_for(output.get(), timeout=1) for _ in range(2)]
+            relay.cancel()
+            return updates
+
+        self.assertEqual(["first", "second"], self.async_run_with_timeout(run()))
+
+    def test_relay_pauses_draining_when_output_backlog_exceeds_ring_capacity(self):
+        async def run():
+            buffer = _RingBuffer(capacity=4)
+            output = asyncio.Queue()
+            for update in range(4):
+                output.put_nowait(update)
+            relay = asyncio.get_event_loop().create_task(
+                self.data_source._relay_buffered_updates(buffer, output))
+            await asyncio.sleep(0)
+            buffer.put_batch(["stale", "stale", 1, 2, 3])
+            await asyncio.sleep(0)
+            relay.cancel()
+            return output.qsize(), await buffer.get_batch()
+
+        backlog_size, retained = self.async_run_with_timeout(run())
+
+        # The relay left the backlogged output queue untouched and the ring dropped its oldest
+        # updates once full (one slot is kept empty, so capacity=4 retains three)
+        self.assertEqual(4, backlog_size)
+        self.assertEqual([1, 2, 3], retained)
+
+    def test_handle_spot_order_batches_updates_into_queue(self):
+        queue = _RingBuffer()
+        orders = [
+            {
+                "id": 1,
+                "client_order_id": "OID1",
+                "status": "new",
+                "price": "10000",
+                "quantity": "1",
+                "quantity_cumulative": "0",
+                "updated_at": "2021-01-01T00:00:00.000Z",
+                "report_type": "new",
+            },
+            {
+                "id": 2,
+                "client_order_id": "OID2",
+                "status": "filled",
+                "price": "10000",
+                "quantity": "1",
+                "quantity_cumulative": "1",
+                "updated_at": "2021-01-01T00:00:01.000Z",
+                "report_type": "trade",
+            },
+        ]
+
+        self.data_source._handle_spot_order(orders, queue)
+
+        self.assertEqual(2, queue.qsize())
+        first_update = self.async_run_with_timeout(queue.get())
+        self.assertEqual(ChangellyOrderUpdate(1, "OID1", "new", "10000", "1", "0", "2021-01-01T00:00:00.000Z"),
+                         first_update)
+        second_update = self.async_run_with_timeout(queue.get())
+        self.assertEqual("filled", second_update.status)
+        self.assertEqual("1", second_update.quantity_cumulative)
+
+    def test_handle_spot_order_converts_single_report_dict(self):
+        queue = _RingBuffer()
+        report = {
+            "id": 3,
+            "client_order_id": "OID3",
+            "status": "partiallyFilled",
+            "price": "20000",
+            "quantity": "2",
+            "quantity_cumulative": "0.5",
+            "updated_at": "2021-01-01T00:00:02.000Z",
+            "report_type": "trade",
+        }
+
+        self.data_source._handle_spot_order(report, queue)
+
+        self.assertEqual(1, queue.qsize())
+        update = self.async_run_with_timeout(queue.get())
+        self.assertEqual(ChangellyOrderUpdate(3, "OID3", "partiallyFilled", "20000", "2", "0.5",
+                                              "2021-01-01T00:00:02.000Z"),
+                         update)
+
+    def test_handlers_ignore_empty_snapshots(self):
+        queue = _RingBuffer()
+
+        self.data_source._handle_spot_order([], queue)
+        self.data_source._handle_spot_balance([], queue)
+
+        self.assertTrue(queue.empty())
+
+    def test_handle_spot_balance_falls_back_to_plain_asyncio_queue(self):
+        queue = asyncio.Queue()
+        balances = [{"currency": "BTC", "available": "1", "reserved": "0"}]
+
+        self.data_source._handle_spot_balance(balances, queue)
+
+        self.assertEqual(1, queue.qsize())
+        self.assertEqual(ChangellyBalanceUpdate("BTC", "1", "0"), queue.get_nowait())
+
+    def test_process_ws_messages_decodes_raw_frames(self):
+        raw_frame = json.dumps(
+            {"method": "spot_balance", "params": [{"currency": "BTC", "available": "1", "reserved": "0"}]}
+        ).encode("utf-8")
+
+        ws = MagicMock()
+
+        async def iter_messages():
+            yield WSResponse(data=raw_frame)
+
+        ws.iter_messages = iter_messages
+        queue = _RingBuffer()
+
+        self.async_run_with_timeout(self.data_source._process_ws_messages(ws=ws, output=queue))
+
+        self.assertEqual(1, queue.qsize())
+        self.assertEqual(ChangellyBalanceUpdate("BTC", "1", "0"), self.async_run_with_timeout(queue.get()))
+
+    def test_send_ping_cb_skips_ping_while_connection_recently_active(self):
+        ws = MagicMock()
+        ws.send = AsyncMock()
+
+        async def run():
+            loop = asyncio.get_running_loop()
+            self.data_source._last_ws_message_sent_timestamp = loop.time()
+            self.data_source._send_ping_cb(ws)
+            await asyncio.sleep(0)
+            self.data_source._cancel_ping()
+
+        self.async_run_with_timeout(run())
+
+        ws.send.assert_not_called()
+
+    def test_send_ping_cb_sends_ping_after_idle_interval(self):
+        ws = MagicMock()
+        ws.send = AsyncMock()
+
+        async def run():
+            loop = asyncio.get_running_loop()
+            self.data_source._last_ws_message_sent_timestamp = (
+                loop.time() - CONSTANTS.WS_HEARTBEAT_TIME_INTERVAL)
+            self.data_source._send_ping_cb(ws)
+            for _ in range(3):
+                await asyncio.sleep(0)
+            self.data_source._cancel_ping()
+
+        self.async_run_with_timeout(run())
+
+        self.assertEqual(1, ws.send.call_count)
+        self.assertEqual({"method": "ping"}, ws.send.call_args.args[0].payload)
+
+    def test_cancel_ping_disposes_scheduled_timer(self):
+        async def run():
+            self.data_source._schedule_ping(MagicMock())
+            handle = self.data_source._ping_handle
+            self.assertIsNotNone(handle)
+            self.data_source._cancel_ping()
+            self.assertTrue(handle.cancelled())
+            self.assertIsNone(self.data_source._ping_handle)
+
+        self.async_run_with_timeout(run())
+
+
+class ChangellyUserStreamListenFlowTests(TestCase):
+    # the level is required to receive logs from the data source logger
+    level = 0
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        super().setUpClass()
+        cls.ev_loop = asyncio.get_event_loop()
+        cls.trading_pair = "COINALPHA-HBOT"
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.log_records = []
+        self.listening_task: Optional[asyncio.Task] = None
+        self.mocking_assistant = NetworkMockingAssistant()
+
+        self.auth = ChangellyAuth(api_key="TEST_API_KEY", secret_key="TEST_SECRET")
+        self.api_factory = WebAssistantsFactory(
+            throttler=AsyncThrottler(rate_limits=[]),
+            auth=self.auth,
+        )
+        self.data_source = ChangellyAPIUserStreamDataSource(
+            auth=self.auth,
+            trading_pairs=[self.trading_pair],
+            api_factory=self.api_factory,
+        )
+
+        self.data_source.logger().setLevel(1)
+        self.data_source.logger().addHandler(self)
+
+    def tearDown(self) -> None:
+        self.listening_task and self.listening_task.cancel()
+        super().tearDown()
+
+    def handle(self, record):
+        self.log_records.append(record)
+
+    def _is_logged(self, log_level: str, message: str) -> bool:
+        return any(record.levelname == log_level and record.getMessage() == message
+                   for record in self.log_records)
+
+    def async_run_with_timeout(self, coroutine: Awaitable, timeout: float = 1):
+        ret = self.ev_loop.run_until_complete(asyncio.wait_for(coroutine, timeout))
+        return ret
+
+    @patch("aiohttp.ClientSession.ws_connect", new_callable=AsyncMock)
+    def test_listen_for_user_stream_authenticates_and_subscribes(self, mock_ws):
+        mock_ws.return_value = self.mocking_assistant.create_websocket_mock()
+        self.mocking_assistant.add_websocket_aiohttp_message(
+            websocket_mock=mock_ws.return_value,
+            message=json.dumps({"jsonrpc": "2.0", "id": 1, "result": True}))
+
+        msg_queue = asyncio.Queue()
+        self.listening_task = self.ev_loop.create_task(
+            self.data_source.listen_for_user_stream(msg_queue)
+        )
+
+        self.mocking_assistant.run_until_all_aiohttp_messages_delivered(mock_ws.return_value)
+
+        sent_messages = self.mocking_assistant.json_messages_sent_through_websocket(
+            websocket_mock=mock_ws.return_value)
+
+        self.assertEqual(2, len(sent_messages))
+        login_message = sent_messages[0]
+        self.assertEqual(CONSTANTS.WS_LOGIN_METHOD, login_message["method"])
+        self.assertEqual("HS256", login_message["params"]["type"])
+        self.assertEqual("TEST_API_KEY", login_message["params"]["api_key"])
+        self.assertEqual(
+            {"method": CONSTANTS.SPOT_SUBSCRIBE, "params": {}, "id": self.data_source.SPOT_STREAM_ID},
+            sent_messages[1])
+        self.assertIsNotNone(self.data_source._ping_handle)
+        self.assertTrue(self._is_logged("INFO", "Subscribed to private order and balance channels..."))
+
+    @patch("aiohttp.ClientSession.ws_connect", new_callable=AsyncMock)
+    def test_listen_for_user_stream_queues_converted_order_updates(self, mock_ws):
+        mock_ws.return_value = self.mocking_assistant.create_websocket_mock()
+        snapshot = {
+            "method": CONSTANTS.SPOT_ORDERS_NOTIFICATION,
+            "params": [
+                {
+                    "id": 1,
+                    "client_order_id": "OID1",
+                    "status": "new",
+                    "price": "10000",
+                    "quantity": "1",
+                    "quantity_cumulative": "0",
+                    "updated_at": "2021-01-01T00:00:00.000Z",
+                    "report_type": "new",
+                },
+                {
+                    "id": 2,
+                    "client_order_id": "OID2",
+                    "status": "filled",
+                    "price": "10000",
+                    "quantity": "1",
+                    "quantity_cumulative": "1",
+                    "updated_at": "2021-01-01T00:00:01.000Z",
+                    "report_type": "trade",
+                },
+            ],
+        }
+        self.mocking_assistant.add_websocket_aiohttp_message(
+            websocket_mock=mock_ws.return_value,
+            message=json.dumps(snapshot))
+
+        msg_queue = asyncio.Queue()
+        self.listening_task = self.ev_loop.create_task(
+            self.data_source.listen_for_user_stream(msg_queue)
+        )
+
+        self.mocking_assistant.run_until_all_aiohttp_messages_delivered(mock_ws.return_value)
+
+        first_update = self.async_run_with_timeout(msg_queue.get())
+        second_update = self.async_run_with_timeout(msg_queue.get())
+        self.assertEqual(ChangellyOrderUpdate(1, "OID1", "new", "10000", "1", "0", "2021-01-01T00:00:00.000Z"),
+                         first_update)
+        self.assertEqual(ChangellyOrderUpdate(2, "OID2", "filled", "10000", "1", "1", "2021-01-01T00:00:01.000Z"),
+                         second_update)
+
+    @patch("aiohttp.ClientSession.ws_connect", new_callable=AsyncMock)
+    def test_listen_for_user_stream_queues_converted_balance_updates(self, mock_ws):
+        mock_ws.return_value = self.mocking_assistant.create_websocket_mock()
+        notification = {
+            "method": CONSTANTS.SPOT_BALANCE_NOTIFICATION,
+            "params": [{"currency": "BTC", "available": "1", "reserved": "0"}],
+        }
+        self.mocking_assistant.add_websocket_aiohttp_message(
+            websocket_mock=mock_ws.return_value,
+            message=json.dumps(notification))
+
+        msg_queue = asyncio.Queue()
+        self.listening_task = self.ev_loop.create_task(
+            self.data_source.listen_for_user_stream(msg_queue)
+        )
+
+        self.mocking_assistant.run_until_all_aiohttp_messages_delivered(mock_ws.return_value)
+
+        self.assertEqual(ChangellyBalanceUpdate("BTC", "1", "0"),
+                         self.async_run_with_timeout(msg_queue.get()))
+
+    @patch("aiohttp.ClientSession.ws_connect", new_callable=AsyncMock)
+    def test_listen_for_user_stream_does_not_queue_unknown_methods(self, mock_ws):
+        mock_ws.return_value = self.mocking_assistant.create_websocket_mock()
+        self.mocking_assistant.add_websocket_aiohttp_message(
+            websocket_mock=mock_ws.return_value,
+            message=json.dumps({"method": "spot_fee", "params": [{"symbol": "BTCUSDT"}]}))
+
+        msg_queue = asyncio.Queue()
+        self.listening_task = self.ev_loop.create_task(
+            self.data_source.listen_for_user_stream(msg_queue)
+        )
+
+        self.mocking_assistant.run_until_all_aiohttp_messages_delivered(mock_ws.return_value)
+
+        self.assertEqual(0, msg_queue.qsize())
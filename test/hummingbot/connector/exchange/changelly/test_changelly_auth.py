@@ -0,0 +1,91 @@
+import asyncio
+import hashlib
+import hmac
+from base64 import b64decode
+from typing import Awaitable
+from unittest import TestCase
+from unittest.mock import MagicMock
+
+from hummingbot.connector.exchange.changelly import changelly_constants as CONSTANTS
+from hummingbot.connector.exchange.changelly.changelly_auth import ChangellyAuth
+from hummingbot.core.web_assistant.connections.data_types import RESTMethod, RESTRequest
+
+
+class ChangellyAuthTests(TestCase):
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.api_key = "testApiKey"
+        self.secret_key = "testSecretKey"
+
+        self.mock_time_provider = MagicMock()
+        self.mock_time_provider.time.return_value = 1000
+
+        self.auth = ChangellyAuth(
+            api_key=self.api_key,
+            secret_key=self.secret_key,
+            time_provider=self.mock_time_provider,
+        )
+
+    def async_run_with_timeout(self, coroutine: Awaitable, timeout: int = 1):
+        ret = asyncio.get_event_loop().run_until_complete(asyncio.wait_for(coroutine, timeout))
+        return ret
+
+    def test_rest_authenticate_adds_hs256_authorization_header(self):
+        request = RESTRequest(
+            method=RESTMethod.GET,
+            url=f"{CONSTANTS.REST_URL}/spot/order?symbol=BTCUSDT",
+            is_auth_required=True,
+            throttler_limit_id="/spot/order",
+        )
+
+        self.async_run_with_timeout(self.auth.rest_authenticate(request))
+
+        authorization = request.headers["Authorization"]
+        self.assertTrue(authorization.startswith("HS256 "))
+
+        token = b64decode(authorization.split(" ")[1]).decode()
+        api_key, signature, timestamp = token.split(":")
+        expected_signature = hmac.new(
+            self.secret_key.encode("utf-8"),
+            f"GET/api/3/spot/order?symbol=BTCUSDT{timestamp}".encode("utf-8"),
+            hashlib.sha256,
+        ).hexdigest()
+
+        self.assertEqual(self.api_key, api_key)
+        self.assertEqual(expected_signature, signature)
+
+    def test_rest_authenticate_signs_post_request_body(self):
+        request = RESTRequest(
+            method=RESTMethod.POST,
+            url=f"{CONSTANTS.REST_URL}/spot/order",
+            data='{"symbol": "BTCUSDT"}',
+            is_auth_required=True,
+            throttler_limit_id="/spot/order",
+        )
+
+        self.async_run_with_timeout(self.auth.rest_authenticate(request))
+
+        token = b64decode(request.headers["Authorization"].split(" ")[1]).decode()
+        _, signature, timestamp = token.split(":")
+        expected_signature = hmac.new(
+            self.secret_key.encode("utf-8"),
+            f'POST/api/3/spot/order{{"symbol": "BTCUSDT"}}{timestamp}'.encode("utf-8"),
+            hashlib.sha256,
+        ).hexdigest()
+
+        self.assertEqual(expected_signature, signature)
+
+    def test_ws_authenticate_builds_login_payload(self):
+        payload = self.async_run_with_timeout(self.auth.ws_authenticate())
+
+        self.assertEqual(CONSTANTS.WS_LOGIN_METHOD, payload["method"])
+        params = payload["params"]
+        self.assertEqual("HS256", params["type"])
+        self.assertEqual(self.api_key, params["api_key"])
+        expected_signature = hmac.new(
+            self.secret_key.encode("utf-8"),
+            str(params["timestamp"]).encode("utf-8"),
+            hashlib.sha256,
+        ).hexdigest()
+        self.assertEqual(expected_signature, params["signature"])